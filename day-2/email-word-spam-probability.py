@@ -1,3 +1,5 @@
+import sys
+
 def get_validated_input(prompt, min_val=0, max_val=None):
     """
     Prompts the user for an integer input and validates it.
@@ -35,6 +37,22 @@ def calculate_spam_probability():
     spam_and_free = get_validated_input("Number of emails that are both spam and contain 'free': ",
                                         max_val=min(emails_with_free, spam_emails))
 
+    print_spam_probability(total_emails, emails_with_free, spam_emails, spam_and_free)
+
+def print_spam_probability(total_emails, emails_with_word, spam_emails, spam_and_word, word="free"):
+    """
+    Calculates and prints the probability of an email being spam given it
+    contains `word`, using Bayes' Theorem.
+
+    Args:
+        total_emails (int): Total number of emails.
+        emails_with_word (int): Number of emails containing the word.
+        spam_emails (int): Number of spam emails.
+        spam_and_word (int): Number of spam emails containing the word.
+        word (str): The word, used in the printed labels.
+    """
+    label = word.capitalize()
+
     print("\n--- Calculating Probabilities ---")
 
     # P(Spam) = spam_emails / total_emails
@@ -45,34 +63,52 @@ def calculate_spam_probability():
     p_spam = spam_emails / total_emails
     print(f"P(Spam) = {p_spam:.4f}")
 
-    # P(Free) = emails_with_free / total_emails
-    if emails_with_free == 0:
-        print("Error: P(Free) is zero. Cannot compute P(Spam | Free) as there are no emails with 'free'.")
+    # P(Word) = emails_with_word / total_emails
+    if emails_with_word == 0:
+        print(f"Error: P({label}) is zero. Cannot compute P(Spam | {label}) as there are no emails with '{word}'.")
         return
 
-    p_free = emails_with_free / total_emails
-    print(f"P(Free) = {p_free:.4f}")
+    p_word = emails_with_word / total_emails
+    print(f"P({label}) = {p_word:.4f}")
 
-    # P(Free | Spam) = spam_and_free / spam_emails
+    # P(Word | Spam) = spam_and_word / spam_emails
     if spam_emails == 0:
-        # If there are no spam emails, then P(Free | Spam) is undefined or 0 (depending on interpretation).
-        # In this context, if spam_emails is 0, it implies P(Spam) is 0, and Bayes' Theorem isn't directly applicable for a non-zero P(Free).
-        # We'll set it to 0 as no spam emails means no free in spam.
-        p_free_given_spam = 0.0
-        print("Warning: No spam emails found. P(Free | Spam) is considered 0.")
+        # If there are no spam emails, then P(Word | Spam) is undefined or 0 (depending on interpretation).
+        # In this context, if spam_emails is 0, it implies P(Spam) is 0, and Bayes' Theorem isn't directly applicable for a non-zero P(Word).
+        # We'll set it to 0 as no spam emails means the word never appears in spam.
+        p_word_given_spam = 0.0
+        print(f"Warning: No spam emails found. P({label} | Spam) is considered 0.")
     else:
-        p_free_given_spam = spam_and_free / spam_emails
-        print(f"P(Free | Spam) = {p_free_given_spam:.4f}")
+        p_word_given_spam = spam_and_word / spam_emails
+        print(f"P({label} | Spam) = {p_word_given_spam:.4f}")
 
-    # Bayes' Theorem: P(Spam | Free) = P(Free | Spam) * P(Spam) / P(Free)
-    if p_free == 0:
+    # Bayes' Theorem: P(Spam | Word) = P(Word | Spam) * P(Spam) / P(Word)
+    if p_word == 0:
         # This case is already handled above, but as a double-check for the formula.
-        print("Error: Division by zero (P(Free) is zero). Cannot compute P(Spam | Free).")
+        print(f"Error: Division by zero (P({label}) is zero). Cannot compute P(Spam | {label}).")
         return
 
-    p_spam_given_free = (p_free_given_spam * p_spam) / p_free
+    p_spam_given_word = (p_word_given_spam * p_spam) / p_word
 
-    print(f"\nP(Spam | Free): {p_spam_given_free:.4f}")
+    print(f"\nP(Spam | {label}): {p_spam_given_word:.4f}")
+
+def calculate_spam_probability_from_store(store_path, word):
+    """
+    Calculates the probability of an email being spam given it contains `word`,
+    using counts from a word-count store built by spam_word_store.py.
+    """
+    from spam_word_store import WordCountStore
+
+    with WordCountStore(store_path) as store:
+        emails_with_word, spam_and_word = store.counts(word)
+        total_emails, spam_emails = store.total_emails, store.spam_emails
+
+    print(f"Loaded counts for '{word}' from '{store_path}'.")
+    print_spam_probability(total_emails, emails_with_word, spam_emails, spam_and_word, word=word.lower())
 
 if __name__ == "__main__":
-    calculate_spam_probability()
\ No newline at end of file
+    # Usage: python email-word-spam-probability.py [STORE_PATH WORD]
+    if len(sys.argv) == 3:
+        calculate_spam_probability_from_store(sys.argv[1], sys.argv[2])
+    else:
+        calculate_spam_probability()
\ No newline at end of file
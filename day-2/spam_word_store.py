@@ -0,0 +1,418 @@
+# spam_word_store.py
+
+# Computes the counts needed by email-word-spam-probability.py for every
+# word in a directory of labelled email files:
+#   total_emails, spam_emails, and for each word the number of emails
+#   containing it and the number of spam emails containing it.
+#
+# The mailbox is expected to contain a "spam" and a "ham" subdirectory
+# (nested folders are fine). Each file is parsed as an email and the
+# Subject header and decoded text parts are tokenized, so header fields,
+# base64 or quoted-printable encoding and attachments do not add words.
+# Files are parsed and tokenized in a process pool and the per-worker counts
+# are merged, map-reduce style. The result is saved as a single binary file
+# that is memory-mapped on open, so a store with millions of words opens
+# instantly and lookups are binary searches.
+#
+# File layout (all integers are unsigned 64-bit, native byte order):
+#   MAGIC (8 bytes) | header length (8 bytes) | JSON header, padded to 8 bytes
+#   offsets[vocab_size + 1] | emails[vocab_size] | spam_emails[vocab_size]
+#   vocabulary (UTF-8 words sorted by their bytes, concatenated)
+#
+# A sidecar "<store>.ingested" file lists every email already counted, so
+# update_store only parses files that were added since the last run.
+
+import email
+import email.policy
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+MAGIC = b"SPAMWC1\0"
+LABEL_DIRS = {"spam": True, "ham": False}
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+
+# --- 1. Parsing and Counting (Map) ---
+
+
+def tokenize(text):
+    """
+    Splits text into the set of distinct lowercase words it contains.
+
+    Args:
+        text (str): The email text.
+
+    Returns:
+        set: The distinct words. Each email counts at most once per word.
+    """
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def email_text(raw):
+    """
+    Extracts the text to tokenize from a raw email: its Subject header and
+    the decoded payload of every text/* part that is not an attachment.
+
+    Args:
+        raw (bytes): The email file contents.
+
+    Returns:
+        str: The subject and text parts, separated by newlines.
+    """
+    message = email.message_from_bytes(raw, policy=email.policy.default)
+    texts = [str(message.get("Subject", ""))]
+    for part in message.walk():
+        if part.get_content_maintype() != "text" or part.is_attachment():
+            continue
+        try:
+            texts.append(part.get_content())
+        except (LookupError, ValueError):
+            # Unknown or broken charset: decode the transfer encoding only.
+            payload = part.get_payload(decode=True) or b""
+            texts.append(payload.decode("utf-8", errors="replace"))
+    return "\n".join(texts)
+
+
+def _count_batch(mail_dir, batch):
+    """
+    Counts emails and word occurrences for a batch of (relative path, is_spam)
+    pairs. Runs in a worker process. Files that cannot be read (e.g. deleted
+    since the mailbox was listed) are skipped instead of failing the batch.
+
+    Returns:
+        tuple: (total_emails, spam_emails, emails Counter, spam_emails Counter,
+                list of (relative path, error message) for skipped files)
+    """
+    total_emails = 0
+    spam_emails = 0
+    word_emails = Counter()
+    word_spam_emails = Counter()
+    skipped = []
+
+    for path, is_spam in batch:
+        try:
+            with open(os.path.join(mail_dir, path), "rb") as f:
+                raw = f.read()
+        except OSError as error:
+            skipped.append((path, str(error)))
+            continue
+        words = tokenize(email_text(raw))
+        total_emails += 1
+        word_emails.update(words)
+        if is_spam:
+            spam_emails += 1
+            word_spam_emails.update(words)
+
+    return total_emails, spam_emails, word_emails, word_spam_emails, skipped
+
+
+def find_emails(mail_dir):
+    """
+    Lists every email file under the "spam" and "ham" subdirectories.
+
+    Returns:
+        list: (relative path, is_spam) pairs sorted by path.
+    """
+    emails = []
+    for label_dir, is_spam in LABEL_DIRS.items():
+        for root, _, files in os.walk(os.path.join(mail_dir, label_dir)):
+            for name in files:
+                path = os.path.relpath(os.path.join(root, name), mail_dir)
+                emails.append((path, is_spam))
+    emails.sort()
+    return emails
+
+
+def count_emails(mail_dir, emails, max_workers=None, batch_size=1000):
+    """
+    Counts words over the given emails in a process pool (map) and merges
+    the per-batch counts (reduce).
+
+    Args:
+        mail_dir (str): The mailbox directory the paths are relative to.
+        emails (list): (relative path, is_spam) pairs to count.
+        max_workers (int): Number of worker processes (default: CPU count).
+        batch_size (int): Number of emails per task.
+
+    Returns:
+        tuple: (total_emails, spam_emails, emails Counter, spam_emails Counter,
+                list of (relative path, error message) for unreadable files)
+    """
+    batches = [emails[i:i + batch_size] for i in range(0, len(emails), batch_size)]
+
+    total_emails = 0
+    spam_emails = 0
+    word_emails = Counter()
+    word_spam_emails = Counter()
+    skipped = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for batch_total, batch_spam, batch_words, batch_spam_words, batch_skipped in executor.map(
+            partial(_count_batch, mail_dir), batches
+        ):
+            total_emails += batch_total
+            spam_emails += batch_spam
+            word_emails.update(batch_words)
+            word_spam_emails.update(batch_spam_words)
+            skipped.extend(batch_skipped)
+
+    return total_emails, spam_emails, word_emails, word_spam_emails, skipped
+
+
+# --- 2. Memory-Mapped Count Store ---
+
+
+class WordCountStore:
+    """
+    Read-only view of a word-count store file.
+
+    The file is memory-mapped, so opening it costs the same regardless of the
+    vocabulary size, and only the pages touched by a lookup are read.
+
+    Examples:
+        >>> with WordCountStore("counts.bin") as store:
+        ...     store.counts("free")
+        (300, 120)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:8] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"'{path}' is not a word-count store.")
+        (header_length,) = struct.unpack("Q", self._mmap[8:16])
+        self.header = json.loads(self._mmap[16:16 + header_length])
+
+        self.total_emails = self.header["total_emails"]
+        self.spam_emails = self.header["spam_emails"]
+        self.vocab_size = size = self.header["vocab_size"]
+
+        # Arrays start right after the header, which is padded to 8 bytes.
+        start = 16 + header_length + (-header_length % 8)
+        view = memoryview(self._mmap)
+        self._offsets = view[start:start + 8 * (size + 1)].cast("Q")
+        start += 8 * (size + 1)
+        self._emails = view[start:start + 8 * size].cast("Q")
+        start += 8 * size
+        self._spam_emails = view[start:start + 8 * size].cast("Q")
+        start += 8 * size
+        self._vocab = view[start:]
+
+    def __len__(self):
+        return self.vocab_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory map.
+        """
+        for view in (self._offsets, self._emails, self._spam_emails, self._vocab):
+            view.release()
+        self._mmap.close()
+
+    def _word_bytes(self, index):
+        return self._vocab[self._offsets[index]:self._offsets[index + 1]].tobytes()
+
+    def _find(self, word):
+        target = word.encode("utf-8")
+        low, high = 0, self.vocab_size
+        while low < high:
+            mid = (low + high) // 2
+            if self._word_bytes(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.vocab_size and self._word_bytes(low) == target:
+            return low
+        return None
+
+    def __contains__(self, word):
+        return self._find(word.lower()) is not None
+
+    def counts(self, word):
+        """
+        Returns the counts for a word.
+
+        Args:
+            word (str): The word (matched after lowercasing).
+
+        Returns:
+            tuple: (emails containing the word, spam emails containing the word).
+                   Both are 0 for unknown words.
+        """
+        index = self._find(word.lower())
+        if index is None:
+            return 0, 0
+        return self._emails[index], self._spam_emails[index]
+
+    def items(self):
+        """
+        Yields (word, emails, spam_emails) for every word in sorted order.
+        """
+        for index in range(self.vocab_size):
+            yield self._word_bytes(index).decode("utf-8"), self._emails[index], self._spam_emails[index]
+
+
+def _write_store(path, total_emails, spam_emails, entries, ingested_files):
+    """
+    Writes a store file from (word bytes, emails, spam_emails) entries that
+    are already sorted by word bytes. The new file replaces `path` atomically.
+    """
+    offsets = array("Q", [0])
+    emails = array("Q")
+    spam = array("Q")
+    vocab = bytearray()
+    for word, word_emails, word_spam in entries:
+        vocab += word
+        offsets.append(len(vocab))
+        emails.append(word_emails)
+        spam.append(word_spam)
+
+    header = json.dumps({
+        "total_emails": total_emails,
+        "spam_emails": spam_emails,
+        "vocab_size": len(emails),
+        "ingested_files": ingested_files,
+    }).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (-len(header) % 8))
+        offsets.tofile(f)
+        emails.tofile(f)
+        spam.tofile(f)
+        f.write(vocab)
+    os.replace(tmp_path, path)
+
+
+def _merge_entries(store, word_emails, word_spam_emails):
+    """
+    Merges the sorted words of an existing store (or None) with new counts.
+    Yields (word bytes, emails, spam_emails) in sorted order.
+    """
+    new_words = sorted((word.encode("utf-8"), word) for word in word_emails)
+    old_size = len(store) if store is not None else 0
+    i = j = 0
+    while i < old_size or j < len(new_words):
+        old_word = store._word_bytes(i) if i < old_size else None
+        new_word = new_words[j][0] if j < len(new_words) else None
+
+        if new_word is None or (old_word is not None and old_word < new_word):
+            yield old_word, store._emails[i], store._spam_emails[i]
+            i += 1
+            continue
+
+        word = new_words[j][1]
+        emails, spam = word_emails[word], word_spam_emails[word]
+        if old_word == new_word:
+            emails += store._emails[i]
+            spam += store._spam_emails[i]
+            i += 1
+        yield new_word, emails, spam
+        j += 1
+
+
+def _ingested_path(store_path):
+    return store_path + ".ingested"
+
+
+def _read_ingested(store_path):
+    with open(_ingested_path(store_path), encoding="utf-8") as f:
+        return set(f.read().splitlines())
+
+
+def update_store(mail_dir, store_path, max_workers=None, batch_size=1000):
+    """
+    Adds every email in `mail_dir` that the store has not counted yet,
+    creating the store if it does not exist.
+
+    Only new files are parsed; their counts are merged with the existing
+    sorted arrays in a single pass. Files that cannot be read are reported
+    and skipped, and picked up again by the next update.
+
+    Args:
+        mail_dir (str): Mailbox directory with "spam" and "ham" subdirectories.
+        store_path (str): Path of the store file.
+        max_workers (int): Number of worker processes (default: CPU count).
+        batch_size (int): Number of emails per task.
+
+    Returns:
+        int: The number of newly counted emails.
+    """
+    store = WordCountStore(store_path) if os.path.exists(store_path) else None
+    try:
+        ingested = _read_ingested(store_path) if store is not None else set()
+        if store is not None and len(ingested) != store.header["ingested_files"]:
+            raise ValueError(
+                f"'{_ingested_path(store_path)}' does not match the store. "
+                "Delete both files and rebuild."
+            )
+
+        new_emails = [(path, is_spam) for path, is_spam in find_emails(mail_dir) if path not in ingested]
+        if not new_emails and store is not None:
+            return 0
+
+        total_emails, spam_emails, word_emails, word_spam_emails, skipped = count_emails(
+            mail_dir, new_emails, max_workers, batch_size
+        )
+        # Unreadable files are left out of the ingested list so the next
+        # update retries them.
+        if skipped:
+            print(f"Warning: Skipped {len(skipped)} unreadable emails. They will be retried on the next update.")
+            for path, error in skipped:
+                print(f"  - {path}: {error}")
+            skipped_paths = {path for path, _ in skipped}
+            new_emails = [(path, is_spam) for path, is_spam in new_emails if path not in skipped_paths]
+            # Nothing readable was added, so the existing store is unchanged.
+            if not new_emails and store is not None:
+                return 0
+        if store is not None:
+            total_emails += store.total_emails
+            spam_emails += store.spam_emails
+
+        _write_store(
+            store_path,
+            total_emails,
+            spam_emails,
+            _merge_entries(store, word_emails, word_spam_emails),
+            len(ingested) + len(new_emails),
+        )
+    finally:
+        if store is not None:
+            store.close()
+
+    # Record the newly counted files only once the store has been replaced.
+    with open(_ingested_path(store_path), "a", encoding="utf-8") as f:
+        f.writelines(path + "\n" for path, _ in new_emails)
+    return len(new_emails)
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    # Usage: python spam_word_store.py MAIL_DIR STORE_PATH
+    if len(sys.argv) != 3:
+        print("Usage: python spam_word_store.py MAIL_DIR STORE_PATH")
+        sys.exit(1)
+
+    added = update_store(sys.argv[1], sys.argv[2])
+    with WordCountStore(sys.argv[2]) as store:
+        print(f"Added {added} emails. The store now holds {store.total_emails} emails "
+              f"({store.spam_emails} spam) and {len(store)} words.")
@@ -1,5 +1,7 @@
 import random
 import math
+import sys
+import timeit
 
 
 def sigmoid(z):
@@ -9,15 +11,53 @@ def sigmoid(z):
     return 1 / (1 + math.exp(-z))
 
 
+# --- Lookup-Table Sigmoid ---
+# A table of sigmoid values over [LUT_MIN, LUT_MAX], read with linear
+# interpolation. It replaces the clamp and math.exp call with one table
+# lookup. Interpolation error is bounded by step^2 / 8 * max|sigmoid''|
+# (about 1.8e-7 here), and beyond the domain the clamped table ends differ
+# from sigmoid by at most sigmoid(-16) (about 1.1e-7).
+LUT_MIN = -16.0
+LUT_MAX = 16.0
+LUT_SIZE = 8192
+LUT_MAX_ABS_ERROR = 2.5e-7
+
+_LUT_SCALE = LUT_SIZE / (LUT_MAX - LUT_MIN)
+_LUT_OFFSET = -LUT_MIN * _LUT_SCALE
+_LUT_VALUES = [sigmoid(LUT_MIN + i / _LUT_SCALE) for i in range(LUT_SIZE + 1)]
+_LUT_SLOPES = [_LUT_VALUES[i + 1] - _LUT_VALUES[i] for i in range(LUT_SIZE)]
+
+
+def fast_sigmoid(z):
+    """
+    Calculates an interpolated lookup-table approximation of sigmoid.
+    Absolute error is below LUT_MAX_ABS_ERROR for every finite input.
+    Like sigmoid, whose clamp turns NaN into 500, NaN maps to the top of
+    the table (within LUT_MAX_ABS_ERROR of 1.0).
+    """
+    t = z * _LUT_SCALE + _LUT_OFFSET
+    if 0.0 < t < LUT_SIZE:
+        i = int(t)
+        return _LUT_VALUES[i] + (t - i) * _LUT_SLOPES[i]
+    # NaN fails `t <= 0.0` too, so it takes the top end like in sigmoid.
+    return _LUT_VALUES[0] if t <= 0.0 else _LUT_VALUES[LUT_SIZE]
+
+
 def relu(z):
     """Calculates the Rectified Linear Unit (ReLU) activation function."""
     return max(0, z)
 
 
-def run_configurable_network():
+def run_configurable_network(fast_activation=False):
     """
     Builds and computes a 2-layer neural network based on user specifications.
+
+    Args:
+        fast_activation (bool): Use the lookup-table fast_sigmoid wherever
+                                sigmoid would be used.
     """
+    sigmoid_function = fast_sigmoid if fast_activation else sigmoid
+
     try:
         # --- 1. Get User Configuration ---
         num_inputs = int(input("Enter number of inputs: "))
@@ -50,7 +90,7 @@ def run_configurable_network():
         # --- 3. Perform Forward Pass ---
         # --- Hidden Layer Calculation ---
         hidden_outputs = []
-        activation_function = relu if activation_choice == "relu" else sigmoid
+        activation_function = relu if activation_choice == "relu" else sigmoid_function
 
         for i in range(num_hidden_neurons):
             # Calculate net input (z) for the neuron
@@ -71,7 +111,7 @@ def run_configurable_network():
             + output_bias
         )
         # The final output is always passed through a sigmoid function for this network
-        final_output = sigmoid(output_net_input)
+        final_output = sigmoid_function(output_net_input)
 
         # --- 4. Print All Values ---
         print("\n--- Inputs ---")
@@ -99,6 +139,30 @@ def run_configurable_network():
         print(f"\nAn unexpected error occurred: {e}")
 
 
+def benchmark_sigmoid(num_samples=100000, repeats=20):
+    """
+    Times fast_sigmoid against the clamped math.exp sigmoid and reports
+    the maximum absolute error over a dense sweep of [-20, 20].
+    """
+    samples = [random.uniform(-10, 10) for _ in range(num_samples)]
+
+    exact_time = timeit.timeit(lambda: [sigmoid(z) for z in samples], number=repeats)
+    fast_time = timeit.timeit(lambda: [fast_sigmoid(z) for z in samples], number=repeats)
+    num_calls = num_samples * repeats
+
+    sweep = [-20 + 40 * i / 1000000 for i in range(1000001)]
+    max_error = max(abs(fast_sigmoid(z) - sigmoid(z)) for z in sweep)
+
+    print("--- Sigmoid Benchmark ---")
+    print(f"Exact sigmoid: {exact_time / num_calls * 1e9:.1f} ns/call")
+    print(f"Fast sigmoid:  {fast_time / num_calls * 1e9:.1f} ns/call")
+    print(f"Speedup: {exact_time / fast_time:.2f}x")
+    print(f"Max absolute error: {max_error:.2e} (bound: {LUT_MAX_ABS_ERROR:.1e})")
+
+
 # --- Main execution block ---
 if __name__ == "__main__":
-    run_configurable_network()
+    if "--benchmark" in sys.argv:
+        benchmark_sigmoid()
+    else:
+        run_configurable_network(fast_activation="--fast" in sys.argv)
@@ -1,5 +1,8 @@
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
 
 # --- 1. Activation Functions ---
 
@@ -58,40 +61,71 @@ def forward_pass(inputs, weights, biases, activation_fn):
     return a
 
 
-# --- 3. Main Simulation ---
+ACTIVATION_FUNCTIONS = {
+    "Sigmoid": sigmoid,
+    "Tanh": tanh,
+    "ReLU": relu,
+    "Leaky ReLU": leaky_relu,
+}
+
+
+# --- 3. Network Generation ---
 
 
-def run_simulation(seed=42):
+def generate_network(rng):
     """
-    Generates a random network, runs the simulation, and plots the results.
+    Randomly generates a network structure, its input vector and parameters.
+
+    Args:
+        rng (np.random.Generator or np.random.RandomState): The source of
+            randomness. A RandomState reproduces the legacy np.random.seed
+            stream used by run_simulation.
+
+    Returns:
+        tuple: (layer_sizes, inputs, weights, biases)
     """
-    np.random.seed(seed)
-    print(f"Random Seed: {seed}\n")
+    randint = rng.integers if isinstance(rng, np.random.Generator) else rng.randint
 
     # --- a. Randomly Generate Network Structure ---
-    num_inputs = np.random.randint(3, 7)
-    num_hidden_layers = np.random.randint(1, 4)
+    num_inputs = randint(3, 7)
+    num_hidden_layers = randint(1, 4)
 
     # Define the number of neurons in each layer
     layer_sizes = [num_inputs]
     for _ in range(num_hidden_layers):
-        layer_sizes.append(np.random.randint(2, 6))
+        layer_sizes.append(randint(2, 6))
     layer_sizes.append(1)  # Single neuron in the output layer
 
     # --- b. Randomly Generate Network Parameters ---
-    inputs = np.random.uniform(-10, 10, size=(num_inputs, 1))
+    inputs = rng.uniform(-10, 10, size=(num_inputs, 1))
     weights = []
     biases = []
 
     # Create weights and biases for each layer transition
     for i in range(len(layer_sizes) - 1):
         # Weight matrix shape: (neurons_in_current_layer, neurons_in_previous_layer)
-        w = np.random.uniform(-1, 1, size=(layer_sizes[i + 1], layer_sizes[i]))
+        w = rng.uniform(-1, 1, size=(layer_sizes[i + 1], layer_sizes[i]))
         # Bias vector shape: (neurons_in_current_layer, 1)
-        b = np.random.uniform(-1, 1, size=(layer_sizes[i + 1], 1))
+        b = rng.uniform(-1, 1, size=(layer_sizes[i + 1], 1))
         weights.append(w)
         biases.append(b)
 
+    return layer_sizes, inputs, weights, biases
+
+
+# --- 4. Main Simulation ---
+
+
+def run_simulation(seed=42, plot=True):
+    """
+    Generates a random network, runs the simulation, and plots the results.
+    """
+    print(f"Random Seed: {seed}\n")
+
+    layer_sizes, inputs, weights, biases = generate_network(np.random.RandomState(seed))
+    num_inputs = layer_sizes[0]
+    num_hidden_layers = len(layer_sizes) - 2
+
     # --- c. Print Network Structure ---
     print("--- Generated Network ---")
     print(f"- Input Features: {num_inputs} -> Values: {np.round(inputs.flatten(), 2)}")
@@ -101,21 +135,246 @@ def run_simulation(seed=42):
     print(f"- Output Layer: {layer_sizes[-1]} neuron\n")
 
     # --- d. Perform Forward Pass for Each Activation ---
-    activation_functions = {
-        "Sigmoid": sigmoid,
-        "Tanh": tanh,
-        "ReLU": relu,
-        "Leaky ReLU": leaky_relu,
-    }
-
     final_outputs = {}
     print("--- Final Outputs ---")
-    for name, func in activation_functions.items():
+    for name, func in ACTIVATION_FUNCTIONS.items():
         output = forward_pass(inputs, weights, biases, func)
         final_outputs[name] = output.flatten()[0]
         print(f"- {name}: {np.round(output.flatten(), 3)}")
 
-    # --- e. Plot the Results ---
+    if plot:
+        plot_final_outputs(final_outputs)
+
+    return final_outputs
+
+
+# --- 5. Population Statistics ---
+
+
+class QuantileSketch:
+    """
+    A mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmically sized buckets (as in DDSketch), so
+    every quantile estimate is within `relative_accuracy` of a value from the
+    data, and memory grows with the log of the value range rather than with
+    the number of values.
+    """
+
+    # Magnitudes below this are counted as exact zeros (e.g. ReLU outputs).
+    MIN_MAGNITUDE = 1e-12
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_buckets(self, buckets, magnitudes):
+        keys, counts = np.unique(
+            np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64),
+            return_counts=True,
+        )
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def update(self, values):
+        """Adds a batch of values to the sketch."""
+        values = np.asarray(values, dtype=float).ravel()
+        positive = values[values > self.MIN_MAGNITUDE]
+        negative = values[values < -self.MIN_MAGNITUDE]
+        if positive.size:
+            self._add_buckets(self.positive, positive)
+        if negative.size:
+            self._add_buckets(self.negative, -negative)
+        self.zero_count += values.size - positive.size - negative.size
+        self.count += values.size
+
+    def merge(self, other):
+        """Adds the counts of another sketch with the same accuracy."""
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _bucket_value(self, key):
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Returns an estimate of the q-th quantile (0 <= q <= 1)."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}.")
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = 0
+        # Walk buckets in ascending value order: most negative first.
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive))
+
+
+class RunningStats:
+    """
+    Streaming count, mean, variance, range and quantiles of a value stream.
+
+    Batches are folded in with Chan et al.'s parallel update, so partial
+    results computed in separate workers can be merged exactly.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        """Adds a batch of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        batch_mean = values.mean()
+        self._combine(values.size, batch_mean, ((values - batch_mean) ** 2).sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sketch.update(values)
+
+    def merge(self, other):
+        """Adds the statistics gathered by another RunningStats."""
+        if other.count == 0:
+            return
+        self._combine(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self):
+        """Population variance of all values seen so far."""
+        return self._m2 / self.count if self.count else float("nan")
+
+    def summary(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """
+        Returns the statistics as a dictionary. Every statistic except the
+        count is NaN if no values have been seen.
+        """
+        empty = self.count == 0
+        result = {
+            "count": self.count,
+            "mean": float("nan") if empty else self.mean,
+            "variance": self.variance,
+            "min": float("nan") if empty else self.min,
+            "max": float("nan") if empty else self.max,
+        }
+        for q in quantiles:
+            result[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return result
+
+
+def _simulate_chunk(seed_sequence, num_networks):
+    """
+    Evaluates `num_networks` random networks with every activation function.
+    Runs in a worker process with its own Generator seeded from `seed_sequence`.
+
+    Returns:
+        dict: Activation name -> RunningStats of the final outputs.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    outputs = {name: np.empty(num_networks) for name in ACTIVATION_FUNCTIONS}
+
+    for n in range(num_networks):
+        _, inputs, weights, biases = generate_network(rng)
+        for name, func in ACTIVATION_FUNCTIONS.items():
+            outputs[name][n] = forward_pass(inputs, weights, biases, func)[0, 0]
+
+    chunk_stats = {}
+    for name, values in outputs.items():
+        chunk_stats[name] = RunningStats()
+        chunk_stats[name].update(values)
+    return chunk_stats
+
+
+def run_population(num_networks=100000, seed=42, chunk_size=1000, max_workers=None, plot=False):
+    """
+    Evaluates many random networks in a process pool without plotting by default
+    and summarises the distribution of final outputs for each activation.
+
+    Each chunk of networks gets an independent Generator stream spawned from
+    `seed`, so the results depend only on `seed` and `chunk_size`, not on the
+    number of workers. Chunk results are merged as they arrive, so memory use
+    does not grow with `num_networks`.
+
+    Args:
+        num_networks (int): Total number of random networks to evaluate.
+        seed (int): Root seed for the spawned per-chunk streams.
+        chunk_size (int): Number of networks evaluated per task.
+        max_workers (int): Number of worker processes (default: CPU count).
+        plot (bool): Whether to plot the summary with matplotlib.
+
+    Returns:
+        dict: Activation name -> RunningStats over all networks.
+    """
+    if num_networks < 1 or chunk_size < 1:
+        raise ValueError("num_networks and chunk_size must be at least 1.")
+
+    num_chunks = -(-num_networks // chunk_size)
+    chunk_sizes = [chunk_size] * (num_chunks - 1) + [num_networks - chunk_size * (num_chunks - 1)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_chunks)
+
+    population_stats = {name: RunningStats() for name in ACTIVATION_FUNCTIONS}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_stats in executor.map(_simulate_chunk, seed_sequences, chunk_sizes):
+            for name, stats in chunk_stats.items():
+                population_stats[name].merge(stats)
+
+    print(f"--- Output Distribution over {num_networks} Networks (Seed: {seed}) ---")
+    for name, stats in population_stats.items():
+        summary = stats.summary()
+        print(
+            f"- {name}: mean={summary['mean']:.4f}, var={summary['variance']:.4f}, "
+            f"p5={summary['p5']:.4f}, median={summary['p50']:.4f}, p95={summary['p95']:.4f}"
+        )
+
+    if plot:
+        plot_population(population_stats)
+
+    return population_stats
+
+
+# --- 6. Plotting ---
+# matplotlib is imported only when a plot is requested, which keeps headless
+# runs and pool worker startup free of its import cost.
+
+
+def plot_final_outputs(final_outputs):
+    """
+    Plots the final output of a single network for each activation function.
+    """
+    import matplotlib.pyplot as plt
+
     names = list(final_outputs.keys())
     values = list(final_outputs.values())
 
@@ -147,7 +406,48 @@ def run_simulation(seed=42):
     plt.show()
 
 
+def plot_population(population_stats):
+    """
+    Plots the mean final output per activation function, with error bars
+    spanning the 5th to 95th percentile of the population.
+    """
+    import matplotlib.pyplot as plt
+
+    names = list(population_stats.keys())
+    summaries = [population_stats[name].summary() for name in names]
+    means = [s["mean"] for s in summaries]
+    lower = [max(s["mean"] - s["p5"], 0) for s in summaries]
+    upper = [max(s["p95"] - s["mean"], 0) for s in summaries]
+
+    plt.style.use("seaborn-v0_8-darkgrid")
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    ax.bar(
+        names,
+        means,
+        yerr=[lower, upper],
+        capsize=8,
+        color=["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"],
+    )
+
+    ax.set_ylabel("Final Output Value (mean, p5-p95)", fontsize=12)
+    ax.set_title(
+        f"Activation Outputs over {summaries[0]['count']} Random Networks",
+        fontsize=16,
+        pad=20,
+    )
+    ax.tick_params(axis="x", labelsize=12)
+    ax.tick_params(axis="y", labelsize=10)
+
+    plt.tight_layout()
+    plt.show()
+
+
 # --- Main execution block ---
 if __name__ == "__main__":
-    # You can change the seed to generate a different network
-    run_simulation(seed=42)
+    if "--population" in sys.argv:
+        # Headless batch mode: summarise 10^5 random networks.
+        run_population(num_networks=100000, seed=42)
+    else:
+        # You can change the seed to generate a different network
+        run_simulation(seed=42)
@@ -0,0 +1,331 @@
+import sys
+import time
+
+import numpy as np
+
+from problem import ACTIVATION_FUNCTIONS, generate_network
+
+# --- 1. In-Place Activations and Their Derivatives ---
+# Each activation writes f(z) into a preallocated `out` array, and each
+# derivative writes f'(z) into `out` using the cached z and a = f(z), so the
+# training loop allocates no new arrays per step.
+
+LEAKY_RELU_ALPHA = 0.01  # Same default as leaky_relu in problem.py
+
+
+def sigmoid_(z, out):
+    np.clip(z, -500, 500, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    out += 1
+    np.reciprocal(out, out=out)
+
+
+def sigmoid_derivative_(z, a, out):
+    # sigmoid'(z) = a * (1 - a)
+    np.subtract(1, a, out=out)
+    out *= a
+
+
+def tanh_(z, out):
+    np.tanh(z, out=out)
+
+
+def tanh_derivative_(z, a, out):
+    # tanh'(z) = 1 - a^2
+    np.multiply(a, a, out=out)
+    np.subtract(1, out, out=out)
+
+
+def relu_(z, out):
+    np.maximum(z, 0, out=out)
+
+
+def relu_derivative_(z, a, out):
+    # relu'(z) = 1 if z > 0 else 0
+    np.greater(z, 0, out=out)
+
+
+def leaky_relu_(z, out):
+    np.multiply(z, LEAKY_RELU_ALPHA, out=out)
+    np.maximum(z, out, out=out)
+
+
+def leaky_relu_derivative_(z, a, out):
+    # leaky_relu'(z) = 1 if z > 0 else alpha
+    np.greater(z, 0, out=out)
+    out *= 1 - LEAKY_RELU_ALPHA
+    out += LEAKY_RELU_ALPHA
+
+
+# Keyed like ACTIVATION_FUNCTIONS in problem.py.
+ACTIVATIONS = {
+    "Sigmoid": (sigmoid_, sigmoid_derivative_),
+    "Tanh": (tanh_, tanh_derivative_),
+    "ReLU": (relu_, relu_derivative_),
+    "Leaky ReLU": (leaky_relu_, leaky_relu_derivative_),
+}
+
+
+# --- 2. Trainer ---
+
+
+class NumpyTrainer:
+    """
+    Mini-batch SGD trainer for the networks built in problem.py.
+
+    The network layout follows forward_pass: weights[i] has shape
+    (layer_sizes[i + 1], layer_sizes[i]), biases[i] has shape
+    (layer_sizes[i + 1], 1), samples are columns, and the chosen activation
+    is applied after every layer, including the output layer. The loss is
+    the mean squared error 0.5 * mean(sum((output - target)^2)).
+
+    All activations, gradients and the batch itself live in buffers that are
+    allocated once for `batch_size` and reused by every step.
+
+    Args:
+        weights (list): Weight matrices. They are copied, not trained in place.
+        biases (list): Bias column vectors. They are copied as well.
+        activation (str): One of "Sigmoid", "Tanh", "ReLU", "Leaky ReLU".
+        batch_size (int): Number of samples per step.
+        learning_rate (float): SGD step size.
+    """
+
+    def __init__(self, weights, biases, activation="Sigmoid", batch_size=32, learning_rate=0.01):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation '{activation}'. Choose from {list(ACTIVATIONS)}.")
+
+        self.weights = [np.array(w, dtype=np.float64) for w in weights]
+        self.biases = [np.array(b, dtype=np.float64) for b in biases]
+        self.activation = activation
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self._activate, self._derivative = ACTIVATIONS[activation]
+
+        sizes = [self.weights[0].shape[1]] + [w.shape[0] for w in self.weights]
+        self._x = np.empty((sizes[0], batch_size))
+        self._y = np.empty((sizes[-1], batch_size))
+        # Cached forward pass: z (pre-activation) and a (activation) per layer.
+        self._z = [np.empty((n, batch_size)) for n in sizes[1:]]
+        self._a = [np.empty((n, batch_size)) for n in sizes[1:]]
+        # Backward pass buffers.
+        self._delta = [np.empty((n, batch_size)) for n in sizes[1:]]
+        self._slope = [np.empty((n, batch_size)) for n in sizes[1:]]
+        self._grad_w = [np.empty_like(w) for w in self.weights]
+        self._grad_b = [np.empty_like(b) for b in self.biases]
+
+    def forward(self, x):
+        """
+        Runs a forward pass over one batch and caches every layer's z and a.
+
+        Args:
+            x (np.array): Inputs of shape (n_inputs, batch_size).
+
+        Returns:
+            np.array: The output activations (a view of an internal buffer).
+        """
+        a = x
+        for w, b, z, out in zip(self.weights, self.biases, self._z, self._a):
+            np.matmul(w, a, out=z)
+            z += b
+            self._activate(z, out)
+            a = out
+        return a
+
+    def backward(self, x, y):
+        """
+        Computes analytic gradients of the loss for the batch cached by the
+        last forward pass. Gradients are stored in the gradient buffers.
+
+        Returns:
+            float: The batch loss.
+        """
+        last = len(self.weights) - 1
+
+        # Output layer: dL/dz = (a - y) / batch_size * f'(z)
+        delta = self._delta[last]
+        np.subtract(self._a[last], y, out=delta)
+        loss = 0.5 * np.vdot(delta, delta) / self.batch_size
+        delta /= self.batch_size
+        self._derivative(self._z[last], self._a[last], self._slope[last])
+        delta *= self._slope[last]
+
+        for i in range(last, -1, -1):
+            a_prev = self._a[i - 1] if i > 0 else x
+            np.matmul(self._delta[i], a_prev.T, out=self._grad_w[i])
+            np.sum(self._delta[i], axis=1, keepdims=True, out=self._grad_b[i])
+            if i > 0:
+                # Propagate to the previous layer: dL/dz_prev = W^T dL/dz * f'(z_prev)
+                np.matmul(self.weights[i].T, self._delta[i], out=self._delta[i - 1])
+                self._derivative(self._z[i - 1], self._a[i - 1], self._slope[i - 1])
+                self._delta[i - 1] *= self._slope[i - 1]
+
+        return loss
+
+    def step(self, x, y):
+        """
+        Runs one SGD step (forward, backward, update) on one batch.
+
+        Args:
+            x (np.array): Inputs of shape (n_inputs, batch_size).
+            y (np.array): Targets of shape (n_outputs, batch_size).
+
+        Returns:
+            float: The batch loss before the update.
+        """
+        # The preallocated buffers are float64; this is a no-op for float64 input.
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.forward(x)
+        loss = self.backward(x, y)
+        for param, grad in zip(self.weights + self.biases, self._grad_w + self._grad_b):
+            grad *= self.learning_rate
+            param -= grad
+        return loss
+
+    def fit(self, x, y, epochs=10, rng=None):
+        """
+        Trains on a dataset with mini-batch SGD.
+
+        Samples are shuffled every epoch and gathered into the preallocated
+        batch buffers. A final batch smaller than batch_size is skipped.
+
+        Args:
+            x (np.array): Inputs of shape (n_inputs, n_samples).
+            y (np.array): Targets of shape (n_outputs, n_samples).
+            epochs (int): Number of passes over the data.
+            rng (np.random.Generator): Source of the shuffling order.
+
+        Returns:
+            list: The mean batch loss of each epoch.
+        """
+        # Convert once so batches can be gathered into the float64 buffers.
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        rng = rng if rng is not None else np.random.default_rng()
+        n_batches = x.shape[1] // self.batch_size
+        if n_batches == 0:
+            raise ValueError("The dataset has fewer samples than batch_size.")
+
+        history = []
+        for _ in range(epochs):
+            order = rng.permutation(x.shape[1])
+            total = 0.0
+            for i in range(n_batches):
+                batch = order[i * self.batch_size:(i + 1) * self.batch_size]
+                np.take(x, batch, axis=1, out=self._x)
+                np.take(y, batch, axis=1, out=self._y)
+                total += self.step(self._x, self._y)
+            history.append(total / n_batches)
+        return history
+
+    def loss(self, x, y):
+        """
+        Returns the loss over a whole dataset without training.
+        Uses the forward pass from problem.py, so it works for any size.
+        """
+        a = x
+        activation_fn = ACTIVATION_FUNCTIONS[self.activation]
+        for w, b in zip(self.weights, self.biases):
+            a = activation_fn(np.dot(w, a) + b)
+        return 0.5 * np.sum((a - y) ** 2) / x.shape[1]
+
+
+# --- 3. Benchmark Against Torch Autograd ---
+
+
+def benchmark_against_torch(weights, biases, x, y, activation="Sigmoid", batch_size=32, learning_rate=0.01, steps=2000):
+    """
+    Times the NumPy trainer against an equivalent torch autograd loop on CPU.
+
+    Both run the same float64 network, data, batches and SGD update, so
+    their final parameters should agree to rounding error.
+
+    Returns:
+        dict: Steps per second for each engine and the largest parameter
+              difference after training, or None if torch is not installed.
+    """
+    try:
+        import torch
+    except ImportError:
+        print("torch is not installed; skipping the comparison.")
+        return None
+
+    torch_activations = {
+        "Sigmoid": torch.sigmoid,
+        "Tanh": torch.tanh,
+        "ReLU": torch.relu,
+        "Leaky ReLU": lambda z: torch.nn.functional.leaky_relu(z, LEAKY_RELU_ALPHA),
+    }
+    torch_activation = torch_activations[activation]
+    n_batches = x.shape[1] // batch_size
+    batches = [
+        (np.ascontiguousarray(x[:, i * batch_size:(i + 1) * batch_size]),
+         np.ascontiguousarray(y[:, i * batch_size:(i + 1) * batch_size]))
+        for i in range(n_batches)
+    ]
+
+    # --- NumPy ---
+    trainer = NumpyTrainer(weights, biases, activation, batch_size, learning_rate)
+    start = time.perf_counter()
+    for i in range(steps):
+        trainer.step(*batches[i % n_batches])
+    numpy_time = time.perf_counter() - start
+
+    # --- Torch autograd ---
+    params = [torch.tensor(p, dtype=torch.float64, requires_grad=True) for p in weights + biases]
+    torch_weights, torch_biases = params[:len(weights)], params[len(weights):]
+    torch_batches = [(torch.from_numpy(bx), torch.from_numpy(by)) for bx, by in batches]
+    start = time.perf_counter()
+    for i in range(steps):
+        bx, by = torch_batches[i % n_batches]
+        a = bx
+        for w, b in zip(torch_weights, torch_biases):
+            a = torch_activation(w @ a + b)
+        loss = 0.5 * ((a - by) ** 2).sum() / batch_size
+        loss.backward()
+        with torch.no_grad():
+            for p in params:
+                p -= learning_rate * p.grad
+                p.grad.zero_()
+    torch_time = time.perf_counter() - start
+
+    max_difference = max(
+        np.max(np.abs(p - t.detach().numpy()))
+        for p, t in zip(trainer.weights + trainer.biases, params)
+    )
+    return {
+        "numpy_steps_per_sec": steps / numpy_time,
+        "torch_steps_per_sec": steps / torch_time,
+        "max_parameter_difference": max_difference,
+    }
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+    layer_sizes, _, weights, biases = generate_network(rng)
+    print(f"Layer sizes: {[int(n) for n in layer_sizes]}")
+
+    # Regression target in (0, 1) that every activation can fit reasonably.
+    x = rng.uniform(-1, 1, size=(layer_sizes[0], 4096))
+    y = 1 / (1 + np.exp(-x.sum(axis=0, keepdims=True)))
+
+    print("\n--- Training (20 epochs, batch size 32) ---")
+    for name in ACTIVATIONS:
+        trainer = NumpyTrainer(weights, biases, name, batch_size=32, learning_rate=0.1)
+        initial_loss = trainer.loss(x, y)
+        trainer.fit(x, y, epochs=20, rng=np.random.default_rng(0))
+        print(f"- {name}: loss {initial_loss:.4f} -> {trainer.loss(x, y):.4f}")
+
+    if "--benchmark" in sys.argv:
+        print("\n--- NumPy vs. Torch Autograd (CPU, steps/sec) ---")
+        for batch_size in (32, 512):
+            result = benchmark_against_torch(weights, biases, x, y, batch_size=batch_size)
+            if result is None:
+                break
+            print(
+                f"- Batch {batch_size}: NumPy {result['numpy_steps_per_sec']:,.0f}, "
+                f"Torch {result['torch_steps_per_sec']:,.0f} "
+                f"(max parameter difference {result['max_parameter_difference']:.1e})"
+            )
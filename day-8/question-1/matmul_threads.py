@@ -0,0 +1,250 @@
+# matmul_threads.py
+
+# Shape-aware autotuner for the number of CPU threads torch uses in matmuls.
+#
+# By default torch runs every CPU op with one intra-op thread per core. For
+# tiny products like (3x2) @ (2x3) the cost of waking those threads dwarfs
+# the arithmetic, and mid-size shapes are often fastest with fewer threads
+# than cores. The autotuner benchmarks torch.set_num_threads choices once per
+# shape bucket, remembers the fastest in a JSON cache file, and applies it
+# around matmul-heavy code with a context manager:
+#
+#     autotuner = ThreadAutotuner()
+#     with autotuner.threads_for(A, B):
+#         for _ in range(10000):
+#             C = A @ B
+#
+# Tuning a new bucket takes a benchmark of min_time seconds per candidate
+# thread count, so only wrap regions that run many matmuls of that shape.
+#
+# torch.set_num_threads is process-wide, so the setting also applies to any
+# other torch work running on other Python threads inside the block.
+
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+
+import torch
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "matmul_threads.json")
+
+# Thread count torch picked on import, used as the baseline and upper limit.
+DEFAULT_NUM_THREADS = torch.get_num_threads()
+
+# (m, k, n) shapes of (m x k) @ (k x n) used by report_sweep.
+STANDARD_SHAPES = [
+    (3, 2, 3),
+    (16, 16, 16),
+    (64, 64, 64),
+    (128, 128, 128),
+    (256, 256, 256),
+    (512, 512, 512),
+    (1024, 1024, 1024),
+    (64, 4096, 64),
+]
+
+
+def _round_up_pow2(dim):
+    return 1 << max(dim - 1, 0).bit_length()
+
+
+def bucket_dims(m, k, n, batch=1):
+    """
+    Rounds every dimension of a (batch x m x k) @ (batch x k x n) product up
+    to a power of two. Shapes with the same rounded dimensions share a bucket.
+    """
+    return tuple(_round_up_pow2(dim) for dim in (batch, m, k, n))
+
+
+def shape_bucket(m, k, n, dtype=torch.float32, batch=1):
+    """
+    Returns the cache key of a matmul workload: its dtype, rounded batch size
+    and rounded shape, e.g. (3, 2, 3) in float32 -> "float32:b1:4x2x4".
+    """
+    rounded_batch, bm, bk, bn = bucket_dims(m, k, n, batch)
+    return f"{str(dtype).replace('torch.', '')}:b{rounded_batch}:{bm}x{bk}x{bn}"
+
+
+def candidate_thread_counts(max_threads=DEFAULT_NUM_THREADS):
+    """
+    Returns the thread counts to try: powers of two up to max_threads, and
+    max_threads itself.
+    """
+    counts = []
+    threads = 1
+    while threads < max_threads:
+        counts.append(threads)
+        threads *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def time_matmul(m, k, n, num_threads, min_time=0.05, dtype=torch.float32, batch=1):
+    """
+    Measures the average time of one (m x k) @ (k x n) product, or of a
+    batched product of `batch` such matrices when batch > 1.
+
+    The product is repeated until at least `min_time` seconds have passed,
+    after a short warm-up that lets the thread pool resize.
+
+    Returns:
+        float: Seconds per matmul.
+    """
+    leading = (batch,) if batch > 1 else ()
+    A = torch.randn(*leading, m, k, dtype=dtype)
+    B = torch.randn(*leading, k, n, dtype=dtype)
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        for _ in range(3):
+            A @ B
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                A @ B
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                return elapsed / iterations
+            iterations *= 2
+    finally:
+        torch.set_num_threads(previous)
+
+
+class ThreadAutotuner:
+    """
+    Picks, caches and applies the fastest thread count per matmul shape bucket.
+
+    Args:
+        cache_path (str): JSON file the tuned settings are stored in. The
+                          cache is discarded if it was written for a different
+                          core count, torch version or key format.
+        thread_counts (list): Thread counts to try (default: powers of two up
+                              to the default thread count).
+        min_time (float): Minimum benchmark time per candidate, in seconds.
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, thread_counts=None, min_time=0.05):
+        self.cache_path = cache_path
+        self.thread_counts = thread_counts or candidate_thread_counts()
+        self.min_time = min_time
+        self.fingerprint = {
+            "torch": torch.__version__,
+            "cpu_count": os.cpu_count(),
+            "default_threads": DEFAULT_NUM_THREADS,
+            # Bumped whenever the bucket key format changes.
+            "key_format": 2,
+        }
+        self.best = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("fingerprint") != self.fingerprint:
+            return {}
+        return cache.get("buckets", {})
+
+    def _save(self):
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": self.fingerprint, "buckets": self.best}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+
+    def tune(self, m, k, n, dtype=torch.float32, batch=1):
+        """
+        Benchmarks every candidate thread count for a bucket and caches the
+        best one. The bucket's representative shape and batch size are used
+        with the given dtype, so every workload in the bucket gets the same
+        setting.
+
+        Returns:
+            dict: Thread count -> seconds per matmul.
+        """
+        bucket = shape_bucket(m, k, n, dtype, batch)
+        rounded_batch, bm, bk, bn = bucket_dims(m, k, n, batch)
+        timings = {
+            threads: time_matmul(bm, bk, bn, threads, self.min_time, dtype, rounded_batch)
+            for threads in self.thread_counts
+        }
+        # Prefer the fewest threads within 5% of the fastest, so timing noise
+        # does not pick a larger pool that only adds contention.
+        fastest = min(timings.values())
+        self.best[bucket] = min(t for t, seconds in timings.items() if seconds <= fastest * 1.05)
+        self._save()
+        return timings
+
+    def best_threads(self, m, k, n, dtype=torch.float32, batch=1):
+        """
+        Returns the tuned thread count for a workload, tuning it on first use.
+        """
+        bucket = shape_bucket(m, k, n, dtype, batch)
+        if bucket not in self.best:
+            self.tune(m, k, n, dtype, batch)
+        return self.best[bucket]
+
+    @contextmanager
+    def threads(self, m, k, n, dtype=torch.float32, batch=1):
+        """
+        Context manager that sets the tuned thread count for `batch`
+        (m x k) @ (k x n) products in `dtype` and restores the previous
+        count on exit.
+        """
+        previous = torch.get_num_threads()
+        torch.set_num_threads(self.best_threads(m, k, n, dtype, batch))
+        try:
+            yield
+        finally:
+            torch.set_num_threads(previous)
+
+    def threads_for(self, A, B):
+        """
+        Same as threads(), with the shape, dtype and batch size taken from
+        the operands of A @ B. Both operands must have at least two
+        dimensions; the batch size is the product of their broadcast
+        leading dimensions.
+        """
+        batch = math.prod(torch.broadcast_shapes(A.shape[:-2], B.shape[:-2]))
+        return self.threads(A.shape[-2], A.shape[-1], B.shape[-1], A.dtype, batch)
+
+
+def report_sweep(autotuner=None, shapes=STANDARD_SHAPES):
+    """
+    Prints matmul throughput with torch's default thread count and with the
+    tuned thread count for every shape in the sweep.
+
+    Returns:
+        list: (shape, default GFLOP/s, tuned threads, tuned GFLOP/s) per shape.
+    """
+    autotuner = autotuner or ThreadAutotuner()
+    rows = []
+    print(f"{'Shape (m x k x n)':>20} {'Default':>12} {'Threads':>8} {'Tuned':>12} {'Speedup':>8}")
+    for m, k, n in shapes:
+        flops = 2 * m * k * n
+        default_time = time_matmul(m, k, n, DEFAULT_NUM_THREADS, autotuner.min_time)
+        threads = autotuner.best_threads(m, k, n)
+        tuned_time = time_matmul(m, k, n, threads, autotuner.min_time)
+        default_gflops = flops / default_time / 1e9
+        tuned_gflops = flops / tuned_time / 1e9
+        rows.append(((m, k, n), default_gflops, threads, tuned_gflops))
+        print(
+            f"{f'{m}x{k}x{n}':>20} {default_gflops:>9.3f} GF/s {threads:>8} "
+            f"{tuned_gflops:>9.3f} GF/s {default_time / tuned_time:>7.2f}x"
+        )
+    return rows
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    print(f"Default intra-op threads: {DEFAULT_NUM_THREADS}")
+    print(f"Candidate thread counts: {candidate_thread_counts()}\n")
+    report_sweep()
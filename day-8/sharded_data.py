@@ -0,0 +1,255 @@
+# sharded_data.py
+
+# Large-scale version of the synthetic binary classification dataset that
+# generate_or_load_data builds in the day-8 notebooks. Instead of creating the
+# whole dataset in memory and writing one CSV, the data is generated in
+# fixed-size shards by a pool of worker processes. Each shard is written
+# straight into memory-mappable .npy files, and a manifest.json describes
+# every shard so training code can open any shard on its own.
+#
+# Layout of a dataset directory:
+#   manifest.json
+#   shard-000000-features.npy   (rows x n_features, float32)
+#   shard-000000-labels.npy     (rows, int8)
+#   ...
+
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SHARD_PATTERN = re.compile(r"shard-(\d+)-(?:features|labels)\.npy")
+
+N_CLASSES = 2
+CLUSTERS_PER_CLASS = 2
+
+
+def make_cluster_centroids(n_features, seed, class_sep=1.0):
+    """
+    Picks the cluster centroids shared by every shard.
+
+    As in make_classification, each class is made of clusters centred on
+    distinct vertices of a hypercube with side 2 * class_sep. The centroids
+    depend only on `seed`, so all shards come from the same distribution.
+
+    Args:
+        n_features (int): Number of features (hypercube dimensions).
+        seed (int): Seed of the dataset.
+        class_sep (float): Half the side length of the hypercube.
+
+    Returns:
+        np.array: Centroids of shape (N_CLASSES * CLUSTERS_PER_CLASS, n_features).
+                  Cluster k belongs to class k % N_CLASSES.
+    """
+    n_clusters = N_CLASSES * CLUSTERS_PER_CLASS
+    if not 2 <= n_features <= 62:
+        raise ValueError("n_features must be between 2 and 62.")
+
+    rng = np.random.default_rng(seed)
+    vertex_ids = rng.choice(2**n_features, size=n_clusters, replace=False)
+    bits = (vertex_ids[:, None] >> np.arange(n_features)) & 1
+    return (2 * bits - 1).astype(np.float32) * class_sep
+
+
+def _shard_filenames(index):
+    return f"shard-{index:06d}-features.npy", f"shard-{index:06d}-labels.npy"
+
+
+def _remove_stale_shards(output_dir, n_shards):
+    """
+    Deletes shard files left by an earlier dataset whose index is at or above
+    `n_shards`. Lower indices are overwritten by the new shards.
+    """
+    for name in os.listdir(output_dir):
+        match = SHARD_PATTERN.fullmatch(name)
+        if match and int(match.group(1)) >= n_shards:
+            os.remove(os.path.join(output_dir, name))
+
+
+def _write_shard(index, rows, output_dir, seed, centroids):
+    """
+    Generates one shard and writes it to disk. Runs in a worker process.
+
+    The shard's random stream is seeded from (seed, index), so its contents
+    do not depend on which worker writes it or in which order.
+    """
+    rng = np.random.default_rng([seed, index])
+    features_name, labels_name = _shard_filenames(index)
+    n_features = centroids.shape[1]
+
+    features = np.lib.format.open_memmap(
+        os.path.join(output_dir, features_name),
+        mode="w+",
+        dtype=np.float32,
+        shape=(rows, n_features),
+    )
+    labels = np.lib.format.open_memmap(
+        os.path.join(output_dir, labels_name),
+        mode="w+",
+        dtype=np.int8,
+        shape=(rows,),
+    )
+
+    # Unit-variance Gaussian noise around a randomly chosen cluster centroid.
+    clusters = rng.integers(0, len(centroids), size=rows)
+    rng.standard_normal(out=features, dtype=np.float32)
+    features += centroids[clusters]
+    labels[:] = clusters % N_CLASSES
+
+    features.flush()
+    labels.flush()
+    del features, labels
+
+    return {"features": features_name, "labels": labels_name, "rows": rows}
+
+
+def generate_sharded_data(output_dir, n_samples, n_features=2, shard_rows=1_000_000, seed=1, max_workers=None):
+    """
+    Generates a synthetic binary classification dataset as on-disk shards.
+
+    At most one shard per worker is held in memory at a time, so
+    `n_samples` is limited only by disk space. The manifest is written last,
+    and an existing manifest in `output_dir` is removed before any shard is
+    written, so an interrupted run never leaves a directory that looks
+    complete. Shards of the old dataset beyond the new shard count are
+    deleted.
+
+    Args:
+        output_dir (str): Directory to write the shards and manifest into.
+        n_samples (int): Total number of rows.
+        n_features (int): Number of input features.
+        shard_rows (int): Number of rows per shard (the last may be smaller).
+        seed (int): Seed of the dataset. The same seed and shard_rows always
+                    produce the same data.
+        max_workers (int): Number of worker processes (default: CPU count).
+
+    Returns:
+        dict: The manifest.
+    """
+    if n_samples < 1 or shard_rows < 1:
+        raise ValueError("n_samples and shard_rows must be positive.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    centroids = make_cluster_centroids(n_features, seed)
+
+    # Remove the manifest of any dataset being overwritten before touching
+    # its shards, so a crash cannot leave it describing mixed shards.
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    n_shards = -(-n_samples // shard_rows)
+    _remove_stale_shards(output_dir, n_shards)
+    shard_sizes = [shard_rows] * (n_shards - 1) + [n_samples - shard_rows * (n_shards - 1)]
+    write_shard = partial(_write_shard, output_dir=output_dir, seed=seed, centroids=centroids)
+
+    shards = []
+    offset = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for index, shard in enumerate(executor.map(write_shard, range(n_shards), shard_sizes)):
+            shard["index"] = index
+            shard["offset"] = offset
+            offset += shard["rows"]
+            shards.append(shard)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "n_samples": n_samples,
+        "n_features": n_features,
+        "n_classes": N_CLASSES,
+        "feature_columns": [f"feature_{i + 1}" for i in range(n_features)],
+        "features_dtype": "float32",
+        "labels_dtype": "int8",
+        "shard_rows": shard_rows,
+        "seed": seed,
+        "centroids": centroids.tolist(),
+        "shards": shards,
+    }
+
+    # Write to a temporary file and rename it so the manifest appears atomically.
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    return manifest
+
+
+def load_manifest(output_dir):
+    """
+    Loads the manifest of a sharded dataset.
+    """
+    with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def generate_or_load_sharded_data(output_dir, n_samples, **kwargs):
+    """
+    Generates a sharded dataset if `output_dir` has no manifest yet,
+    otherwise loads the existing manifest.
+    Extra keyword arguments are passed to generate_sharded_data. When loading,
+    n_samples and any n_features, shard_rows or seed given must match the
+    manifest.
+    """
+    if not os.path.exists(os.path.join(output_dir, MANIFEST_NAME)):
+        print(f"No dataset in '{output_dir}'. Generating {n_samples} rows.")
+        return generate_sharded_data(output_dir, n_samples, **kwargs)
+
+    print(f"Loading existing dataset from '{output_dir}'.")
+    manifest = load_manifest(output_dir)
+    requested = {"n_samples": n_samples}
+    requested.update({key: kwargs[key] for key in ("n_features", "shard_rows", "seed") if key in kwargs})
+    for key, value in requested.items():
+        if manifest[key] != value:
+            raise ValueError(
+                f"'{output_dir}' holds a dataset with {key}={manifest[key]}, not {value}."
+            )
+    return manifest
+
+
+def open_shard(output_dir, index, manifest=None):
+    """
+    Opens one shard as read-only memory-mapped arrays.
+
+    Args:
+        output_dir (str): The dataset directory.
+        index (int): The shard index.
+        manifest (dict): The loaded manifest (loaded from disk if omitted).
+
+    Returns:
+        tuple: (features, labels) as np.memmap arrays.
+    """
+    if manifest is None:
+        manifest = load_manifest(output_dir)
+    shard = manifest["shards"][index]
+    features = np.load(os.path.join(output_dir, shard["features"]), mmap_mode="r")
+    labels = np.load(os.path.join(output_dir, shard["labels"]), mmap_mode="r")
+    return features, labels
+
+
+def iter_shards(output_dir):
+    """
+    Yields (features, labels) for every shard in order.
+    """
+    manifest = load_manifest(output_dir)
+    for index in range(len(manifest["shards"])):
+        yield open_shard(output_dir, index, manifest)
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    # Usage: python sharded_data.py OUTPUT_DIR N_SAMPLES
+    if len(sys.argv) != 3:
+        print("Usage: python sharded_data.py OUTPUT_DIR N_SAMPLES")
+        sys.exit(1)
+
+    manifest = generate_or_load_sharded_data(sys.argv[1], int(sys.argv[2]))
+    print(f"{manifest['n_samples']} rows in {len(manifest['shards'])} shards.")